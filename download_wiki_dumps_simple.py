@@ -3,6 +3,8 @@
 Simple Wikipedia Cirrus Dump Downloader (No external dependencies)
 
 Downloads Wikimedia Cirrus dumps using only Python standard library.
+If the optional indexed_bzip2 package is installed, shards are
+decompressed in parallel across all CPU cores.
 """
 
 import argparse
@@ -10,27 +12,96 @@ import os
 import sys
 import urllib.request
 import urllib.error
+import http.client
+import io
 from pathlib import Path
 import time
+import threading
+import queue
 import bz2
-import gzip
+import zlib
 import re
-from html.parser import HTMLParser
-from urllib.parse import quote
+import shutil
+import contextlib
+import hashlib
+import functools
+import html
+from urllib.parse import quote, urljoin, urlsplit
+from concurrent.futures import ThreadPoolExecutor
+from collections import deque
+
+try:
+    import indexed_bzip2
+except ImportError:
+    indexed_bzip2 = None
+
+
+# Read size for network downloads and buffer size for shard files
+IO_BUFFER_SIZE = 1024 * 1024
+# Amount of decompressed data moved per read while concatenating shards
+COPY_CHUNK_SIZE = 4 * 1024 * 1024
+# Write buffer for the concatenated output file
+OUTPUT_BUFFER_SIZE = 4 * 1024 * 1024
+# Output space reserved up front, as a multiple of the total shard size
+PREALLOCATE_RATIO = 2
+
+# Decompressed chunks each streaming shard may buffer ahead of the writer
+STREAM_QUEUE_CHUNKS = 8
+# Times in a row a dropped streaming shard is resumed without getting any data
+STREAM_RESUMES = 3
+
+# Files at least this large are fetched as several parallel byte ranges.
+# RANGE_SEGMENTS is the number of connections to keep busy: with fewer
+# download workers than that, each shard is split into
+# RANGE_SEGMENTS // workers ranges, and with as many or more it isn't split.
+RANGE_MIN_SIZE = 64 * 1024 * 1024
+RANGE_SEGMENTS = 4
+
+# Retries for a request the server throttles, waiting as Retry-After asks
+# (or backing off exponentially), at most RETRY_MAX_DELAY seconds each time
+REQUEST_RETRIES = 3
+RETRY_STATUSES = (429, 503)
+RETRY_MAX_DELAY = 60
 
 
 class DownloadProgressBar:
-    """Simple progress bar for downloads."""
+    """Simple progress bar for downloads. Safe to share between threads.
 
-    def __init__(self, total_size, desc="Downloading"):
+    Redraws at most every ``min_interval`` seconds, so frequent small
+    updates only cost an addition.
+    """
+
+    def __init__(self, total_size, desc="Downloading", min_interval=0.1):
         self.total_size = total_size
         self.desc = desc
         self.downloaded = 0
-        self.start_time = time.time()
+        self.start_time = time.monotonic()
+        self.min_interval = min_interval
+        self._last_print = 0.0
+        self._lock = threading.Lock()
+        self._line_width = 0
 
     def update(self, chunk_size):
-        self.downloaded += chunk_size
-        elapsed = time.time() - self.start_time
+        with self._lock:
+            self.downloaded += chunk_size
+            if time.monotonic() - self._last_print >= self.min_interval:
+                self._render()
+
+    def write(self, message):
+        """Print a message on its own line without garbling the bar."""
+        with self._lock:
+            print(message.ljust(self._line_width), flush=True)
+            self._render()
+
+    def close(self):
+        """Draw the final state of the bar and move to the next line."""
+        with self._lock:
+            self._render()
+            print()
+
+    def _render(self):
+        self._last_print = time.monotonic()
+        elapsed = self._last_print - self.start_time
         speed = self.downloaded / elapsed if elapsed > 0 else 0
         speed_mb = speed / (1024 * 1024)
 
@@ -49,85 +120,388 @@ class DownloadProgressBar:
             filled = int(bar_width * self.downloaded / self.total_size)
             bar = "█" * filled + "░" * (bar_width - filled)
 
-            print(f"{self.desc}: [{bar}] {percent:5.1f}% {self.downloaded/1024/1024:05.1f}MB/{self.total_size/1024/1024:4.1f}MB {speed_mb:4.1f}MB/s ETA:{eta_str}",
-                  end='\r', flush=True)
+            line = f"{self.desc}: [{bar}] {percent:5.1f}% {self.downloaded/1024/1024:05.1f}MB/{self.total_size/1024/1024:4.1f}MB {speed_mb:4.1f}MB/s ETA:{eta_str}"
         else:
             # Unknown size - just show bytes downloaded
             mb_downloaded = self.downloaded / (1024 * 1024)
-            print(f"{self.desc}: {mb_downloaded:8.1f}MB downloaded {speed_mb:5.1f}MB/s",
-                  end='\r', flush=True)
+            line = f"{self.desc}: {mb_downloaded:8.1f}MB downloaded {speed_mb:5.1f}MB/s"
+
+        self._line_width = len(line)
+        print(line, end='\r', flush=True)
 
 
-def download_dump(url, output_path):
-    """Download a single dump file with progress."""
+# Per-thread keep-alive connections, keyed by (scheme, host)
+_connections = threading.local()
+
+# Wikimedia's User-Agent policy asks clients to identify themselves
+USER_AGENT = "wiki_graph_extractor/download_wiki_dumps_simple (https://github.com/evintunador/wiki_graph_extractor)"
+
+
+def _get_connection(scheme, netloc):
+    """Return this thread's open connection to ``netloc``, creating it if needed."""
+    pool = _connections.__dict__.setdefault('pool', {})
+    conn = pool.get((scheme, netloc))
+    if conn is None:
+        conn_class = http.client.HTTPSConnection if scheme == 'https' else http.client.HTTPConnection
+        conn = pool[(scheme, netloc)] = conn_class(netloc)
+    return conn
+
+
+def _drop_connection(scheme, netloc):
+    """Close and forget this thread's connection to ``netloc``."""
+    conn = _connections.__dict__.get('pool', {}).pop((scheme, netloc), None)
+    if conn is not None:
+        conn.close()
+
+
+def _retry_delay(error, attempt):
+    """Seconds to wait before retrying a throttled request, from Retry-After if present."""
     try:
-        # Get file info
-        req = urllib.request.Request(url, method='HEAD')
-        with urllib.request.urlopen(req) as response:
-            total_size = int(response.headers.get('Content-Length', 0))
+        delay = float(error.headers.get('Retry-After'))
+    except (AttributeError, TypeError, ValueError):
+        delay = 2 ** attempt
+    return min(max(delay, 0), RETRY_MAX_DELAY)
+
+
+def _request(url, method='GET', headers=None, max_redirects=5):
+    """Send a request, reusing this thread's keep-alive connection to the host.
+
+    Behaves like ``urllib.request.urlopen``: redirects are followed and HTTP
+    errors raise ``urllib.error.HTTPError``. A stale pooled connection is
+    replaced and the request retried once, and a request throttled with 429
+    or 503 is retried up to ``REQUEST_RETRIES`` times. A descriptive
+    User-Agent is sent unless ``headers`` sets one.
+    """
+    headers = {'User-Agent': USER_AGENT, **(headers or {})}
+    for attempt in range(REQUEST_RETRIES + 1):
+        try:
+            return _send(url, method, headers, max_redirects)
+        except urllib.error.HTTPError as e:
+            if e.code not in RETRY_STATUSES or attempt == REQUEST_RETRIES:
+                raise
+            delay = _retry_delay(e, attempt)
+        time.sleep(delay)
+
+
+def _send(url, method, headers, max_redirects):
+    """Send one request for ``_request``, following redirects."""
+    if urllib.request.getproxies().get(urlsplit(url).scheme):
+        # Leave proxy handling to urllib
+        return urllib.request.urlopen(urllib.request.Request(url, method=method, headers=headers))
+
+    for _ in range(max_redirects + 1):
+        parts = urlsplit(url)
+        path = parts.path or '/'
+        if parts.query:
+            path += '?' + parts.query
+
+        for attempt in range(2):
+            conn = _get_connection(parts.scheme, parts.netloc)
+            try:
+                conn.request(method, path, headers=headers)
+                response = conn.getresponse()
+                break
+            except (http.client.HTTPException, OSError):
+                _drop_connection(parts.scheme, parts.netloc)
+                if attempt:
+                    raise
+
+        if response.status in (301, 302, 303, 307, 308) and response.getheader('Location'):
+            response.read()
+            url = urljoin(url, response.getheader('Location'))
+            continue
+        if response.status >= 400:
+            body = response.read()
+            raise urllib.error.HTTPError(url, response.status, response.reason,
+                                         response.headers, io.BytesIO(body))
+        response.url = url  # Final URL after redirects, as urlopen provides
+        return response
+
+    raise urllib.error.HTTPError(url, response.status, "Too many redirects", response.headers, None)
+
+
+@contextlib.contextmanager
+def _urlopen(url, method='GET', headers=None):
+    """Context-manager form of ``_request``.
+
+    If the body was not read to the end, the connection is dropped rather
+    than reused, since unread bytes would corrupt the next response.
+    """
+    response = _request(url, method=method, headers=headers)
+    try:
+        yield response
+    finally:
+        if not response.isclosed():
+            if response.length == 0:
+                response.close()
+            else:
+                parts = urlsplit(response.url)
+                _drop_connection(parts.scheme, parts.netloc)
+                response.close()
+
+
+class GzipStreamWriter:
+    """Write-only gzip stream built directly on ``zlib.compressobj``.
+
+    zlib produces the gzip header and trailer itself (``wbits=31``), so this
+    avoids the extra layers of ``gzip.GzipFile``. ``tell()`` returns the
+    number of uncompressed bytes written, as it does for GzipFile.
+    """
+
+    def __init__(self, fileobj, level=1):
+        self.fileobj = fileobj
+        # memLevel=9 uses the largest hash table: faster and slightly smaller
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31, 9)
+        self._offset = 0
+
+    def write(self, data):
+        self.fileobj.write(self._compressor.compress(data))
+        self._offset += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._offset
+
+    def close(self):
+        if self._compressor is not None:
+            self.fileobj.write(self._compressor.flush())
+            self._compressor = None
+
+    def __enter__(self):
+        return self
 
-        # Download with progress
-        progress = DownloadProgressBar(total_size, os.path.basename(output_path))
+    def __exit__(self, *exc_info):
+        self.close()
 
-        def update_progress(chunk):
-            progress.update(len(chunk))
 
-        # Create custom opener with progress callback
-        class ProgressReporter:
-            def __init__(self, progress_bar):
-                self.progress_bar = progress_bar
+class RangeNotSupportedError(Exception):
+    """Raised when the server answers a Range request with the full file."""
 
-            def __call__(self, block_num, block_size, total_size):
-                self.progress_bar.update(block_size)
 
-        # Download the file
-        urllib.request.urlretrieve(url, output_path, ProgressReporter(progress))
-        print()  # New line after progress bar
+class DownloadAborted(Exception):
+    """Raised inside a worker when its ``abort`` event has been set."""
+
+
+def _check_abort(abort):
+    """Raise DownloadAborted if ``abort`` (a threading.Event or None) is set."""
+    if abort is not None and abort.is_set():
+        raise DownloadAborted()
+
+
+def get_file_info(url):
+    """Return ``(total_size, accepts_ranges)`` from a HEAD request.
+
+    ``total_size`` is 0 if the server does not report a Content-Length.
+    """
+    with _urlopen(url, method='HEAD') as response:
+        total_size = int(response.headers.get('Content-Length', 0))
+        accepts_ranges = response.headers.get('Accept-Ranges', '').lower() == 'bytes'
+    return total_size, accepts_ranges
+
+
+def _download_range(url, output_path, start, end, progress, abort=None):
+    """Download bytes ``start``-``end`` (inclusive) of ``url`` into place in ``output_path``."""
+    _check_abort(abort)
+    with _urlopen(url, headers={'Range': f'bytes={start}-{end}'}) as response:
+        if response.status != 206:
+            raise RangeNotSupportedError(f"Server ignored Range request (HTTP {response.status})")
+
+        written = 0
+        with open(output_path, 'r+b') as f:
+            f.seek(start)
+            while True:
+                _check_abort(abort)
+                chunk = response.read(IO_BUFFER_SIZE)
+                if not chunk:
+                    break
+                f.write(chunk)
+                written += len(chunk)
+                progress.update(len(chunk))
+
+    if written != end - start + 1:
+        raise IOError(f"Range {start}-{end} ended early ({written} of {end - start + 1} bytes)")
+
+
+_segment_executor = None
+_segment_executor_lock = threading.Lock()
+
+
+def _get_segment_executor():
+    """Return the pool that runs every range request, creating it on first use.
+
+    A single long-lived pool caps the range connections at ``RANGE_SEGMENTS``
+    however many shards download at once, and lets its threads reuse their
+    keep-alive connections from one shard to the next. Callers downloading
+    several shards at once split each into fewer segments to match.
+    """
+    global _segment_executor
+    with _segment_executor_lock:
+        if _segment_executor is None:
+            _segment_executor = ThreadPoolExecutor(
+                max_workers=RANGE_SEGMENTS, thread_name_prefix='range'
+            )
+        return _segment_executor
+
+
+def _download_segmented(url, output_path, total_size, progress, segments=RANGE_SEGMENTS,
+                        abort=None):
+    """Download ``url`` as ``segments`` byte ranges fetched in parallel."""
+    # Preallocate so every segment can write at its own offset
+    with open(output_path, 'wb') as f:
+        f.truncate(total_size)
+
+    segment_size = -(-total_size // segments)  # Ceiling division
+    bounds = [
+        (start, min(start + segment_size, total_size) - 1)
+        for start in range(0, total_size, segment_size)
+    ]
+    executor = _get_segment_executor()
+    futures = [
+        executor.submit(_download_range, url, output_path, start, end, progress, abort)
+        for start, end in bounds
+    ]
+    try:
+        for future in futures:
+            future.result()
+    finally:
+        # Don't leave segments of a failed download queued or still writing
+        for future in futures:
+            future.cancel()
+        for future in futures:
+            if not future.cancelled():
+                future.exception()
+
+
+def _check_size(path, expected_size):
+    """Raise IOError if a download is shorter or longer than its Content-Length."""
+    actual_size = os.path.getsize(path)
+    if expected_size and actual_size != expected_size:
+        raise IOError(f"Downloaded {actual_size} bytes but expected {expected_size}")
+
+
+def download_dump(url, output_path, progress=None, file_info=None, abort=None, checksum=None,
+                  segments=RANGE_SEGMENTS):
+    """Download a single dump file with progress.
+
+    If ``progress`` is given, bytes are reported to that (possibly shared)
+    progress bar instead of a per-file one. ``file_info`` is the result of
+    ``get_file_info(url)`` if the caller already has it. If the ``abort``
+    event is set, the download stops and DownloadAborted is raised. If
+    ``checksum`` (an entry of ``find_shard_checksums``) is given, the file is
+    verified against it and a mismatch counts as a failed download.
+
+    Large files on servers that accept byte ranges are downloaded over
+    ``segments`` parallel connections; otherwise, or if ``segments`` is 1, a
+    single stream is used.
+    """
+    shared_progress = progress
+
+    def report(message):
+        # Print through a shared bar so its line isn't garbled
+        if shared_progress is not None:
+            shared_progress.write(message)
+        else:
+            print(f"\n{message}")
+
+    try:
+        # Get file info
+        total_size, accepts_ranges = file_info or get_file_info(url)
+
+        own_progress = progress is None
+        if own_progress:
+            progress = DownloadProgressBar(total_size, os.path.basename(output_path))
+
+        if segments > 1 and accepts_ranges and total_size >= RANGE_MIN_SIZE:
+            try:
+                _download_segmented(url, output_path, total_size, progress, segments, abort)
+                if own_progress:
+                    progress.close()
+                _check_size(output_path, total_size)
+                # Segments arrive out of order, so hash the finished file
+                if checksum is not None:
+                    verify_checksum(output_path, checksum)
+                return True
+            except RangeNotSupportedError as e:
+                report(f"{e}; falling back to a single stream for {os.path.basename(url)}")
+
+        # Download the file in large reads, reporting and hashing each one
+        _check_abort(abort)
+        digest = hashlib.new(checksum[0]) if checksum is not None else None
+        with _urlopen(url) as response, open(output_path, 'wb') as f:
+            while True:
+                _check_abort(abort)
+                chunk = response.read(IO_BUFFER_SIZE)
+                if not chunk:
+                    break
+                f.write(chunk)
+                progress.update(len(chunk))
+                if digest is not None:
+                    digest.update(chunk)
+        if own_progress:
+            progress.close()
+        _check_size(output_path, total_size)
+        if digest is not None:
+            check_digest(digest, checksum[1], os.path.basename(output_path))
         return True
 
+    except DownloadAborted:
+        raise
     except Exception as e:
-        print(f"\nError downloading {url}: {e}")
+        report(f"Error downloading {url}: {e}")
         return False
 
 
-class DirectoryListingParser(HTMLParser):
-    """Parse HTML directory listing to extract file links."""
-    
-    def __init__(self):
-        super().__init__()
-        self.files = []
-        self.directories = []
-    
-    def handle_starttag(self, tag, attrs):
-        if tag == 'a':
-            for attr_name, attr_value in attrs:
-                if attr_name == 'href' and attr_value:
-                    # Skip parent directory links
-                    if attr_value not in ['../', './']:
-                        if attr_value.endswith('/'):
-                            # It's a directory
-                            dir_name = attr_value.rstrip('/')
-                            if dir_name:
-                                self.directories.append(dir_name)
-                        else:
-                            # It's a file
-                            self.files.append(attr_value)
+# Matches the target of every link in an HTML directory listing
+_HREF_RE = re.compile(rb'href=["\']([^"\']+)["\']', re.I)
+
+
+@functools.lru_cache(maxsize=32)
+def _fetch(url):
+    """Fetch ``url`` and return the raw response body.
+
+    Cached because small files such as checksums may be read more than once.
+    """
+    with _urlopen(url) as response:
+        return response.read()
+
+
+@functools.lru_cache(maxsize=32)
+def list_directory(url):
+    """Return ``(files, directories)`` linked from the HTML directory listing at ``url``.
+
+    The listing is scanned line by line as it arrives, so the full HTML is
+    never held in memory. Results are cached because the same listings are
+    read several times per run.
+    """
+    files = []
+    directories = []
+    with _urlopen(url) as response:
+        for line in response:
+            for match in _HREF_RE.finditer(line):
+                href = html.unescape(match.group(1).decode('utf-8'))
+                # Skip parent directory links
+                if href in ['../', './']:
+                    continue
+                if href.endswith('/'):
+                    # It's a directory
+                    dir_name = href.rstrip('/')
+                    if dir_name:
+                        directories.append(dir_name)
+                else:
+                    # It's a file
+                    files.append(href)
+    return tuple(files), tuple(directories)
 
 
 def find_latest_date(base_url):
     """Find the latest available date from the cirrus_search_index directory listing."""
     try:
         print(f"Checking available dates at: {base_url}")
-        with urllib.request.urlopen(base_url) as response:
-            html_content = response.read().decode('utf-8')
-        
-        # Parse HTML to extract directory links
-        parser = DirectoryListingParser()
-        parser.feed(html_content)
+        _, directories = list_directory(base_url)
         
         # Filter for date-like directories (YYYYMMDD format)
         date_pattern = re.compile(r'^\d{8}$')
-        dates = [d for d in parser.directories if date_pattern.match(d)]
+        dates = [d for d in directories if date_pattern.match(d)]
         
         if not dates:
             raise ValueError(f"No date directories found at {base_url}")
@@ -146,9 +520,9 @@ def find_latest_date(base_url):
 
 
 def cleanup_old_dumps(output_dir, confirm=True):
-    """Remove old dump files matching the pattern *wiki-*-cirrussearch-content.json.gz"""
-    pattern = "*wiki-*-cirrussearch-content.json.gz"
-    dump_files = list(output_dir.glob(pattern))
+    """Remove old dump files matching *wiki-*-cirrussearch-content.json.gz or .jsonl"""
+    patterns = ["*wiki-*-cirrussearch-content.json.gz", "*wiki-*-cirrussearch-content.jsonl"]
+    dump_files = [f for pattern in patterns for f in output_dir.glob(pattern)]
     
     if not dump_files:
         print("No old dump files found to clean.")
@@ -180,31 +554,17 @@ def cleanup_old_dumps(output_dir, confirm=True):
 def list_available_indexes(base_url):
     """List available index_name directories for a given date."""
     try:
-        with urllib.request.urlopen(base_url) as response:
-            html_content = response.read().decode('utf-8')
-        
-        parser = DirectoryListingParser()
-        parser.feed(html_content)
-        
-        # Filter for directories starting with "index_name="
-        indexes = [d for d in parser.directories if d.startswith('index_name=')]
+        files, directories = list_directory(base_url)
         
-        # If no directories found, try parsing links differently
-        # Sometimes directories are listed as links without trailing /
-        if not indexes:
-            # Look for any links that contain "index_name="
-            all_items = parser.files + parser.directories
-            indexes = [item for item in all_items if 'index_name=' in item]
-            # Remove file extensions to get directory names
-            indexes = [idx.replace('.json.bz2', '') for idx in indexes]
-            indexes = list(set([idx for idx in indexes if idx.startswith('index_name=')]))
+        # Directories may also be listed as links without a trailing /, or
+        # only via their .json.bz2 files, so normalize every link once
+        candidates = {re.sub(r'\.json\.bz2$', '', item).rstrip('/') for item in files + directories}
+        indexes = sorted(c for c in candidates if c.startswith('index_name='))
         
-        # Also try a simple regex search as fallback
+        # Fall back to a raw search for links the listing parser could not read
         if not indexes:
-            # Look for href="index_name=..." patterns
-            pattern = r'href=["\']?([^"\'>\s]*index_name=[^"\'>\s/]+)'
-            matches = re.findall(pattern, html_content)
-            indexes = list(set([m for m in matches if m.startswith('index_name=')]))
+            matches = re.findall(rb'index_name=[^"\'/>\s]+', _fetch(base_url))
+            indexes = sorted({m.decode('utf-8') for m in matches})
         
         return indexes
     except Exception as e:
@@ -226,16 +586,11 @@ def discover_shard_files(base_url, lang, date):
     print(f"Discovering shard files from: {dir_url}")
     
     try:
-        # Fetch directory listing HTML
-        with urllib.request.urlopen(dir_url) as response:
-            html_content = response.read().decode('utf-8')
-        
-        # Parse HTML to extract file links
-        parser = DirectoryListingParser()
-        parser.feed(html_content)
+        # Fetch directory listing and extract file links
+        files, _ = list_directory(dir_url)
         
         # Filter for .json.bz2 files and sort them
-        shard_files = sorted([f for f in parser.files if f.endswith('.json.bz2')])
+        shard_files = sorted([f for f in files if f.endswith('.json.bz2')])
         
         if not shard_files:
             # Try to list available indexes to help user
@@ -262,12 +617,8 @@ def discover_shard_files(base_url, lang, date):
             encoded_dir_url = f"{base_url}{encoded_subdir}/"
             try:
                 print(f"Trying with URL encoding: {encoded_dir_url}")
-                with urllib.request.urlopen(encoded_dir_url) as response:
-                    html_content = response.read().decode('utf-8')
-                
-                parser = DirectoryListingParser()
-                parser.feed(html_content)
-                shard_files = sorted([f for f in parser.files if f.endswith('.json.bz2')])
+                files, _ = list_directory(encoded_dir_url)
+                shard_files = sorted([f for f in files if f.endswith('.json.bz2')])
                 
                 if shard_files:
                     shard_urls = [f"{base_url}{encoded_subdir}/{f}" for f in shard_files]
@@ -312,59 +663,397 @@ def discover_shard_files(base_url, lang, date):
         raise ValueError(f"Error discovering shard files: {e}")
 
 
-def download_and_concatenate_shards(shard_urls, output_path):
-    """Download all shards, decompress bz2, concatenate, and compress as gzip."""
-    temp_dir = output_path.parent / f".temp_{output_path.stem}"
-    temp_dir.mkdir(exist_ok=True)
+# Checksum file extensions looked for next to each shard, most preferred first
+CHECKSUM_ALGORITHMS = ('sha256', 'sha1', 'md5')
+
+
+def find_shard_checksums(shard_urls):
+    """Map shard URLs to ``(algorithm, checksum_url)`` for published checksum files.
+
+    Looks for ``<shard>.sha256``, ``<shard>.sha1`` or ``<shard>.md5`` in each
+    shard's directory listing. Shards without a checksum file are left out.
+    """
+    listings = {}
+    checksums = {}
+    for url in shard_urls:
+        dir_url, name = url.rsplit('/', 1)
+        if dir_url not in listings:
+            try:
+                listings[dir_url] = set(list_directory(dir_url + '/')[0])
+            except Exception:
+                listings[dir_url] = set()
+        for algorithm in CHECKSUM_ALGORITHMS:
+            if f"{name}.{algorithm}" in listings[dir_url]:
+                checksums[url] = (algorithm, f"{url}.{algorithm}")
+                break
+    return checksums
+
+
+def check_digest(digest, checksum_url, name):
+    """Raise ValueError unless ``digest`` matches the ``sha1sum``-style file at ``checksum_url``."""
+    expected = _fetch(checksum_url).decode('utf-8').split()[0].lower()
+    if digest.hexdigest() != expected:
+        raise ValueError(
+            f"{digest.name} mismatch for {name}: expected {expected}, got {digest.hexdigest()}"
+        )
+
+
+def verify_checksum(path, checksum):
+    """Verify the file at ``path`` against ``checksum``, an entry of ``find_shard_checksums``."""
+    algorithm, checksum_url = checksum
+    digest = hashlib.new(algorithm)
+    with open(path, 'rb') as f:
+        while True:
+            chunk = f.read(COPY_CHUNK_SIZE)
+            if not chunk:
+                break
+            digest.update(chunk)
+    check_digest(digest, checksum_url, os.path.basename(path))
+
+
+@contextlib.contextmanager
+def open_shard(shard_path, parallelization=None):
+    """Open a bz2 shard for reading decompressed bytes.
+
+    Uses indexed_bzip2 to decompress blocks on ``parallelization`` threads
+    (default: all cores) when it is installed, otherwise the standard
+    library's single-threaded bz2 module.
+    """
+    if indexed_bzip2 is not None:
+        parallelization = parallelization or os.cpu_count() or 1
+        with indexed_bzip2.open(str(shard_path), parallelization=parallelization) as bz2_file:
+            yield bz2_file
+    else:
+        # Buffer the compressed input so bz2's small reads don't each hit the disk
+        with open(shard_path, 'rb', buffering=IO_BUFFER_SIZE) as raw_in, \
+                bz2.BZ2File(raw_in, 'rb') as bz2_file:
+            yield bz2_file
+
+
+def append_shard(shard_path, outfile):
+    """Decompress a bz2 shard onto the end of ``outfile``. Returns the bytes written."""
+    start = outfile.tell()
+    with open_shard(shard_path) as bz2_file:
+        shutil.copyfileobj(bz2_file, outfile, length=COPY_CHUNK_SIZE)
+    return outfile.tell() - start
+
+
+def append_file(src_path, outfile):
+    """Append an uncompressed file to the end of ``outfile``. Returns the bytes copied.
+
+    Uses os.copy_file_range so the kernel copies the data without passing it
+    through Python, falling back to shutil.copyfileobj where that is
+    unavailable (non-Linux, older kernels, some cross-filesystem copies).
+    """
+    with open(src_path, 'rb') as src:
+        size = os.fstat(src.fileno()).st_size
+        outfile.flush()
+        copied = 0
+        if hasattr(os, 'copy_file_range'):
+            try:
+                while copied < size:
+                    n = os.copy_file_range(src.fileno(), outfile.fileno(), size - copied)
+                    if n == 0:
+                        break
+                    copied += n
+            except OSError:
+                pass
+        if copied < size:
+            src.seek(copied)
+            shutil.copyfileobj(src, outfile, length=COPY_CHUNK_SIZE)
+    return size
+
+
+def _download_shard(url, shard_path, progress, file_info, decompress, checksum=None, abort=None,
+                    parallelization=None, segments=RANGE_SEGMENTS):
+    """Download one shard into the temp directory and return the path to append.
+
+    If ``checksum`` is given the download is verified against it: hashed as
+    it arrives for a single stream, or read back once finished for a ranged
+    download. With ``decompress``, the shard is also decompressed here, in
+    the worker thread, so that several shards decompress in parallel; the
+    plain file is returned and the bz2 file removed, using
+    ``parallelization`` decoder threads (see ``open_shard``). Setting
+    ``abort`` stops the work early, and ``segments`` is passed on to
+    ``download_dump``.
+    """
+    if not download_dump(url, shard_path, progress, file_info, abort, checksum, segments):
+        raise Exception(f"Failed to download {url}")
+    if not decompress:
+        return shard_path
+
+    plain_path = shard_path.with_suffix('')  # file-000000.json.bz2 -> file-000000.json
+    with open_shard(shard_path, parallelization) as bz2_file, \
+            open(plain_path, 'wb', buffering=IO_BUFFER_SIZE) as plain_file:
+        while True:
+            _check_abort(abort)
+            chunk = bz2_file.read(COPY_CHUNK_SIZE)
+            if not chunk:
+                break
+            plain_file.write(chunk)
+    shard_path.unlink()
+    return plain_path
+
+
+def preallocate(outfile, size):
+    """Reserve ``size`` bytes on disk for ``outfile`` so it is written contiguously.
+
+    Returns False, doing nothing, where ``os.posix_fallocate`` is unavailable
+    (macOS, Windows) or fails (e.g. unsupported filesystem or not enough space).
+    Note that this sets the file's length; truncate it once writing is done.
+    """
+    if size <= 0 or not hasattr(os, 'posix_fallocate'):
+        return False
+    try:
+        os.posix_fallocate(outfile.fileno(), 0, size)
+    except OSError:
+        return False
+    return True
+
+
+def stream_shard(url, progress, chunks, abort, checksum=None):
+    """Download and decompress a bz2 shard in memory, without a temp file.
+
+    Decompressed chunks are put on the ``chunks`` queue, followed by None.
+    Any error is put on the queue instead so the consumer can raise it.
+    Gives up early, without opening the connection or reading further, if
+    ``abort`` is set. If ``checksum`` is given, the compressed bytes are
+    hashed as they arrive and verified before the final None.
+
+    While the queue is full the connection sits idle, and the server may
+    time it out. A dropped connection is resumed with a Range request from
+    the first byte not yet received.
+    """
+    def put(item):
+        while not abort.is_set():
+            try:
+                chunks.put(item, timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    try:
+        digest = hashlib.new(checksum[0]) if checksum is not None else None
+        decompressor = bz2.BZ2Decompressor()
+        in_stream = False
+        if abort.is_set():
+            return
+        received = 0
+        expected_size = None
+        stalled = 0
+        while not abort.is_set():
+            resumed_from = received
+            headers = {'Range': f'bytes={received}-'} if received else None
+            with _urlopen(url, headers=headers) as response:
+                if received and response.status != 206:
+                    raise IOError(f"{os.path.basename(url)} was cut off after {received} bytes "
+                                  f"and the server can't resume it (HTTP {response.status})")
+                if expected_size is None:
+                    expected_size = int(response.getheader('Content-Length') or 0)
+                while not abort.is_set():
+                    try:
+                        data = response.read(IO_BUFFER_SIZE)
+                    except (http.client.HTTPException, OSError):
+                        if not expected_size:
+                            raise
+                        break  # Resumed below
+                    if not data:
+                        break
+                    received += len(data)
+                    progress.update(len(data))
+                    if digest is not None:
+                        digest.update(data)
+                    # A shard may hold several concatenated bz2 streams
+                    while data:
+                        in_stream = True
+                        if not put(decompressor.decompress(data)):
+                            return
+                        if not decompressor.eof:
+                            break
+                        data = decompressor.unused_data
+                        decompressor = bz2.BZ2Decompressor()
+                        in_stream = False
+            if not expected_size or received >= expected_size:
+                break
+            # Give up once resuming stops making progress
+            stalled = 0 if received > resumed_from else stalled + 1
+            if stalled > STREAM_RESUMES:
+                break
+        if abort.is_set():
+            return
+        # read() returns b'' when the connection closes early, which looks
+        # complete if the cut falls between two bz2 streams
+        if expected_size and received != expected_size:
+            raise IOError(f"Downloaded {received} bytes of {os.path.basename(url)} "
+                          f"but expected {expected_size}")
+        if in_stream:
+            raise EOFError(f"{os.path.basename(url)} ended before the end-of-stream marker was reached")
+        if digest is not None:
+            check_digest(digest, checksum[1], os.path.basename(url))
+        put(None)
+    except BaseException as e:
+        put(e)
+
+
+def _append_downloaded_shards(executor, shard_urls, file_infos, temp_dir, progress, outfile,
+                              workers, compress, checksums):
+    """Download shards into ``temp_dir`` and append them to ``outfile`` in order.
+
+    When the output is uncompressed, shards are decompressed by the download
+    workers and copied into ``outfile`` with ``append_file``.
+    """
+    # Keep a bounded window of downloads in flight ahead of the shard
+    # being decompressed; futures are consumed in submission order.
+    jobs = iter(zip(shard_urls, file_infos))
+    pending = deque()
+    abort = threading.Event()
+    # Up to ``workers`` shards download and decompress at once; split the
+    # range connections and the cores between them
+    segments = max(1, RANGE_SEGMENTS // workers)
+    parallelization = max(1, (os.cpu_count() or 1) // workers)
+
+    def submit_next():
+        job = next(jobs, None)
+        if job is not None:
+            url, file_info = job
+            shard_path = temp_dir / os.path.basename(url)
+            pending.append((url, executor.submit(
+                _download_shard, url, shard_path, progress, file_info, not compress,
+                checksums.get(url), abort, parallelization, segments
+            )))
+
+    for _ in range(workers + 1):
+        submit_next()
+
+    total_size = 0
+    try:
+        for i in range(1, len(shard_urls) + 1):
+            url, future = pending.popleft()
+            path = future.result()
+            submit_next()
+
+            if compress:
+                total_size += append_shard(path, outfile)
+            else:
+                total_size += append_file(path, outfile)
+            path.unlink()
+            progress.write(f"[{i}/{len(shard_urls)}] Appended {os.path.basename(url)}")
+    except BaseException:
+        # Don't start downloads that are still queued, and make the running
+        # ones stop at their next read so the executor can shut down promptly
+        abort.set()
+        for _, future in pending:
+            future.cancel()
+        raise
+    return total_size
+
+
+def _append_streamed_shards(executor, shard_urls, progress, outfile, checksums):
+    """Stream-decompress shards in parallel and append them to ``outfile`` in order.
+
+    Only the shard being written runs freely. The ones after it decompress
+    ``STREAM_QUEUE_CHUNKS`` chunks ahead and then wait, so --stream trades
+    most of the download parallelism for not needing temp disk space.
+    """
+    queues = [queue.Queue(maxsize=STREAM_QUEUE_CHUNKS) for _ in shard_urls]
+    abort = threading.Event()
+    futures = [
+        executor.submit(stream_shard, url, progress, chunks, abort, checksums.get(url))
+        for url, chunks in zip(shard_urls, queues)
+    ]
+
+    total_size = 0
+    try:
+        for i, (url, chunks) in enumerate(zip(shard_urls, queues), 1):
+            while True:
+                chunk = chunks.get()
+                if chunk is None:
+                    break
+                if isinstance(chunk, BaseException):
+                    raise chunk
+                outfile.write(chunk)
+                total_size += len(chunk)
+            progress.write(f"[{i}/{len(shard_urls)}] Appended {os.path.basename(url)}")
+    except BaseException:
+        # Unblock the workers still waiting to hand over data and drop the
+        # shards that haven't started yet
+        abort.set()
+        for future in futures:
+            future.cancel()
+        raise
+    return total_size
+
+
+def download_and_concatenate_shards(shard_urls, output_path, workers=4, compress=True, stream=False):
+    """Download all shards, decompress bz2, concatenate, and compress as gzip.
+
+    Shards are downloaded concurrently using up to ``workers`` threads while
+    the main thread decompresses finished shards, in order, into the output.
+    Each shard is deleted as soon as it has been appended, so at most
+    ``workers + 1`` shards are on disk at once.
+
+    If ``stream`` is True, shards are instead decompressed straight from the
+    HTTP response and never written to a temp file. If ``compress`` is False
+    the concatenation is written as plain line-delimited JSON instead,
+    skipping the gzip step entirely.
+    """
+    temp_dir = None
+    if not stream:
+        temp_dir = output_path.parent / f".temp_{output_path.stem}"
+        temp_dir.mkdir(exist_ok=True)
     
     try:
-        downloaded_shards = []
+        print(f"\nDownloading and {'compressing' if compress else 'concatenating'} "
+              f"{len(shard_urls)} shard file(s) using {workers} download worker(s)...")
         
-        # Download all shards
-        print(f"\nDownloading {len(shard_urls)} shard file(s)...")
-        for i, shard_url in enumerate(shard_urls, 1):
-            shard_filename = os.path.basename(shard_url)
-            temp_shard_path = temp_dir / shard_filename
+        with ThreadPoolExecutor(max_workers=workers) as executor, \
+                contextlib.ExitStack() as stack:
+            file_infos = list(executor.map(get_file_info, shard_urls))
+            checksums = find_shard_checksums(shard_urls)
+            if checksums:
+                print(f"Verifying {len(checksums)} shard(s) against published checksums")
+            progress = DownloadProgressBar(
+                sum(size for size, _ in file_infos), f"{len(shard_urls)} shard(s)"
+            )
             
-            print(f"\n[{i}/{len(shard_urls)}] Downloading {shard_filename}...")
-            if not download_dump(shard_url, temp_shard_path):
-                raise Exception(f"Failed to download {shard_url}")
+            outfile = stack.enter_context(open(output_path, 'wb', buffering=OUTPUT_BUFFER_SIZE))
+            estimated_size = sum(size for size, _ in file_infos) * PREALLOCATE_RATIO
+            if preallocate(outfile, estimated_size):
+                # Runs after the gzip trailer is written: drop the unused reservation
+                raw_out = outfile
+                stack.callback(lambda: raw_out.truncate(raw_out.tell()))
+            if compress:
+                # Level 1 keeps recompression cheap; the output is only an intermediate
+                # for dump_extractor.py, so a slightly larger file is the better trade.
+                outfile = stack.enter_context(GzipStreamWriter(outfile, level=1))
             
-            downloaded_shards.append(temp_shard_path)
-        
-        # Decompress, concatenate, and compress
-        print(f"\nConcatenating and compressing shards...")
-        total_size = 0
-        
-        with gzip.open(output_path, 'wb') as outfile:
-            for i, shard_path in enumerate(downloaded_shards, 1):
-                print(f"[{i}/{len(downloaded_shards)}] Processing {shard_path.name}...", end='\r')
-                
-                with bz2.open(shard_path, 'rb') as bz2_file:
-                    while True:
-                        chunk = bz2_file.read(1024 * 1024)  # Read 1MB chunks
-                        if not chunk:
-                            break
-                        outfile.write(chunk)
-                        total_size += len(chunk)
+            if stream:
+                total_size = _append_streamed_shards(
+                    executor, shard_urls, progress, outfile, checksums
+                )
+            else:
+                total_size = _append_downloaded_shards(
+                    executor, shard_urls, file_infos, temp_dir, progress, outfile,
+                    workers, compress, checksums
+                )
+            progress.close()
         
         print(f"\n✓ Successfully created {output_path.name} ({total_size / (1024*1024):.1f} MB uncompressed)")
         
-        # Clean up temporary files
-        print("Cleaning up temporary files...")
-        for shard_path in downloaded_shards:
-            shard_path.unlink()
-        temp_dir.rmdir()
+        if temp_dir is not None:
+            temp_dir.rmdir()
         
         return True
         
     except Exception as e:
         print(f"\n✗ Error processing shards: {e}")
-        # Clean up on error
-        if temp_dir.exists():
-            for shard_path in downloaded_shards:
-                if shard_path.exists():
-                    shard_path.unlink()
+        # Clean up on error, including the incomplete output
+        if output_path.exists():
+            output_path.unlink()
+        if temp_dir is not None and temp_dir.exists():
+            for shard_path in temp_dir.iterdir():
+                shard_path.unlink()
             try:
                 temp_dir.rmdir()
             except:
@@ -372,6 +1061,17 @@ def download_and_concatenate_shards(shard_urls, output_path):
         return False
 
 
+def positive_int(value):
+    """argparse type for counts that must be at least 1."""
+    try:
+        number = int(value)
+    except ValueError:
+        number = 0
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be a positive integer, got {value!r}")
+    return number
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Simple downloader for Wikimedia Cirrus dumps",
@@ -389,6 +1089,9 @@ Examples:
 
   # Clean old dumps before downloading
   python download_wiki_dumps_simple.py --lang en --clean
+
+  # Skip gzip recompression and write plain .jsonl (faster, more disk)
+  python download_wiki_dumps_simple.py --lang en --no-compress
         """
     )
 
@@ -423,6 +1126,28 @@ Examples:
         help='Skip confirmation prompt when using --clean'
     )
 
+    parser.add_argument(
+        '--no-compress',
+        action='store_true',
+        help='Write the dump as uncompressed .jsonl instead of recompressing it as .json.gz '
+             '(much faster, but several times larger on disk)'
+    )
+
+    parser.add_argument(
+        '--stream',
+        action='store_true',
+        help='Decompress shards straight from the network instead of saving them '
+             'to a temp directory first (no temp disk space needed, but later shards '
+             'only read a little ahead of the one being written, so usually slower)'
+    )
+
+    parser.add_argument(
+        '--workers', '-w',
+        type=positive_int,
+        default=4,
+        help='Number of shards to download in parallel (default: 4)'
+    )
+
     args = parser.parse_args()
 
     # Create output directory
@@ -449,10 +1174,11 @@ Examples:
             sys.exit(1)
 
     # Construct filename (maintain same format for compatibility)
+    suffix = "jsonl" if args.no_compress else "json.gz"
     if args.lang == 'simple':
-        filename = f"simplewiki-{dump_date}-cirrussearch-content.json.gz"
+        filename = f"simplewiki-{dump_date}-cirrussearch-content.{suffix}"
     else:
-        filename = f"{args.lang}wiki-{dump_date}-cirrussearch-content.json.gz"
+        filename = f"{args.lang}wiki-{dump_date}-cirrussearch-content.{suffix}"
 
     output_path = args.output_dir / filename
 
@@ -468,7 +1194,10 @@ Examples:
         shard_urls = discover_shard_files(base_url, args.lang, dump_date)
         
         # Download and concatenate shards
-        if download_and_concatenate_shards(shard_urls, output_path):
+        if download_and_concatenate_shards(
+            shard_urls, output_path, workers=args.workers,
+            compress=not args.no_compress, stream=args.stream
+        ):
             print(f"\n✓ Successfully downloaded and processed {filename}")
 
             # Show next steps
@@ -70,6 +70,16 @@ def process_article_worker(article_data, output_dir, write_title: bool):
 # Helper Functions
 # ===========================================================================
 
+def open_dump(input_file):
+    """
+    Opens a dump for reading as text: gzipped (.json.gz) or plain (.jsonl).
+    """
+    if input_file.endswith('.gz'):
+        return gzip.open(input_file, 'rt', encoding='utf-8')
+    if input_file.endswith('.jsonl'):
+        return open(input_file, 'r', encoding='utf-8')
+    raise ValueError(f"Unsupported dump file extension (expected .json.gz or .jsonl): {input_file}")
+
 def read_articles(file_handle, limit):
     """
     A generator that reads the dump file line by line, yielding article data.
@@ -104,7 +114,7 @@ def process_dump(input_file, output_dir, limit=None, process_count=None, write_t
     articles_processed = 0
 
     # The main process will read the file and put articles into the pool
-    with gzip.open(input_file, 'rt', encoding='utf-8') as f:
+    with open_dump(input_file) as f:
         # Create a pool of worker processes
         with Pool(processes=process_count) as pool:
             # Create a partial function with the output_dir already filled in
@@ -147,7 +157,7 @@ def main():
     parser.add_argument(
         "inputs", 
         nargs='+',
-        help="One or more input Wikipedia Cirrus dump files (.json.gz) or directories."
+        help="One or more input Wikipedia Cirrus dump files (.json.gz or .jsonl) or directories."
     )
     parser.add_argument(
         "-o", "--output", 
@@ -187,9 +197,12 @@ def main():
     dump_files = []
     for path in args.inputs:
         if os.path.isdir(path):
-            # Use glob to find all matching files recursively
-            found_files = glob.glob(os.path.join(path, '**', '*.json.gz'), recursive=True)
-            dump_files.extend(found_files)
+            # Use glob to find all matching files recursively. Plain dumps are
+            # matched by their full suffix so other .jsonl files (e.g. the
+            # graph written by build_graph.py) aren't picked up.
+            for pattern in ('*.json.gz', '*-cirrussearch-content.jsonl'):
+                found_files = glob.glob(os.path.join(path, '**', pattern), recursive=True)
+                dump_files.extend(found_files)
         elif os.path.isfile(path):
             dump_files.append(path)
         else:
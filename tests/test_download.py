@@ -0,0 +1,561 @@
+import unittest
+import sys
+import os
+import io
+import bz2
+import gzip
+import queue
+import time
+import hashlib
+import tempfile
+import threading
+import contextlib
+import http.server
+import urllib.error
+from pathlib import Path
+from unittest import mock
+
+# Add parent directory to path to import download_wiki_dumps_simple
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import download_wiki_dumps_simple as dl
+
+
+class FakeResponse(io.BytesIO):
+    """In-memory HTTP response announcing ``length`` (default: the body's) as Content-Length."""
+
+    def __init__(self, body, status=200, length=None):
+        super().__init__(body)
+        self.status = status
+        self.length = len(body) if length is None else length
+
+    def getheader(self, name, default=None):
+        if name.lower() == 'content-length':
+            return str(self.length)
+        return default
+
+
+def fake_urlopen(pages):
+    """Return a stand-in for ``_urlopen`` that serves ``pages``.
+
+    Each value is either the body as bytes or a function taking the request
+    headers and returning a FakeResponse.
+    """
+    @contextlib.contextmanager
+    def _urlopen(url, method='GET', headers=None):
+        page = pages[url]
+        yield page(headers or {}) if callable(page) else FakeResponse(page)
+    return _urlopen
+
+
+class TestDirectoryListing(unittest.TestCase):
+
+    BASE = 'https://dumps.example.org/other/cirrus_search_index/20250108/'
+
+    def setUp(self):
+        # Listings are cached per URL; start every test from a clean slate
+        dl.list_directory.cache_clear()
+        dl._fetch.cache_clear()
+        self.addCleanup(dl.list_directory.cache_clear)
+        self.addCleanup(dl._fetch.cache_clear)
+
+    def serve(self, body):
+        patcher = mock.patch.object(dl, '_urlopen', fake_urlopen({self.BASE: body}))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_list_directory_splits_files_and_directories(self):
+        """Links ending in / are directories, everything else is a file."""
+        self.serve(
+            b'<html><body><pre>\n'
+            b'<a href="../">../</a>\n'
+            b'<a href="./">./</a>\n'
+            b'<a href="index_name=enwiki_content/">index_name=enwiki_content/</a>  08-Jan-2025\n'
+            b'<a href=\'sha256sums.txt\'>sha256sums.txt</a>\n'
+            b'<a href="a.json.bz2">a.json.bz2</a> <a HREF="b.json.bz2">b.json.bz2</a>\n'
+            b'</pre></body></html>\n'
+        )
+        files, directories = dl.list_directory(self.BASE)
+        self.assertEqual(files, ('sha256sums.txt', 'a.json.bz2', 'b.json.bz2'))
+        self.assertEqual(directories, ('index_name=enwiki_content',))
+
+    def test_list_directory_unescapes_entities(self):
+        """HTML entities in hrefs are decoded before the link is classified."""
+        self.serve(
+            b'<a href="../">../</a>\n'
+            b'<a href="index_name=fr&amp;wiki_content/">x</a>\n'
+            b'<a href="file&#47;">y</a>\n'
+            b'<a href="caf&eacute;.json.bz2">z</a>\n'
+        )
+        files, directories = dl.list_directory(self.BASE)
+        self.assertEqual(files, ('café.json.bz2',))
+        self.assertEqual(directories, ('index_name=fr&wiki_content', 'file'))
+
+    def test_list_available_indexes_normalizes_links(self):
+        """Index names are found with or without a trailing / or .json.bz2 suffix."""
+        self.serve(
+            b'<a href="../">../</a>\n'
+            b'<a href="index_name=enwiki_content/">a</a>\n'
+            b'<a href="index_name=dewiki_content">b</a>\n'
+            b'<a href="index_name=frwiki_content.json.bz2">c</a>\n'
+            b'<a href="index_name=enwiki_content.json.bz2">d</a>\n'
+            b'<a href="sha256sums.txt">e</a>\n'
+        )
+        self.assertEqual(
+            dl.list_available_indexes(self.BASE),
+            ['index_name=dewiki_content', 'index_name=enwiki_content', 'index_name=frwiki_content'],
+        )
+
+    def test_list_available_indexes_falls_back_to_raw_search(self):
+        """Links the href parser can't read are still found by the raw search."""
+        self.serve(
+            b'<a href=index_name=simplewiki_content/>simple</a>\n'
+            b'<a href=index_name=enwiki_content/>en</a>\n'
+            b'<a href=index_name=simplewiki_content/>again</a>\n'
+        )
+        self.assertEqual(
+            dl.list_available_indexes(self.BASE),
+            ['index_name=enwiki_content', 'index_name=simplewiki_content'],
+        )
+
+    def test_list_available_indexes_returns_empty_on_error(self):
+        """A listing that can't be fetched yields no indexes rather than an error."""
+        self.serve(b'')
+        self.assertEqual(dl.list_available_indexes(self.BASE + 'missing/'), [])
+
+
+class NullProgress:
+    """Progress bar stand-in that only counts bytes."""
+
+    def __init__(self):
+        self.downloaded = 0
+
+    def update(self, chunk_size):
+        self.downloaded += chunk_size
+
+
+class TestShardIO(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        dl._fetch.cache_clear()
+        self.addCleanup(dl._fetch.cache_clear)
+
+    def path(self, name):
+        return os.path.join(self.tmp.name, name)
+
+    def test_gzip_stream_writer_round_trip(self):
+        """Chunks written through GzipStreamWriter read back intact with gzip."""
+        chunks = [b'{"title": "A"}\n' * 1000, b'', os.urandom(100_000), b'tail\n']
+        path = self.path('out.json.gz')
+        with open(path, 'wb') as f, dl.GzipStreamWriter(f) as writer:
+            written = 0
+            for chunk in chunks:
+                self.assertEqual(writer.write(chunk), len(chunk))
+                written += len(chunk)
+                self.assertEqual(writer.tell(), written)
+        with gzip.open(path, 'rb') as f:
+            self.assertEqual(f.read(), b''.join(chunks))
+
+    def test_append_file(self):
+        """append_file copies after data still sitting in the output buffer."""
+        src = self.path('shard.json')
+        data = os.urandom(3 * dl.COPY_CHUNK_SIZE // 2)
+        with open(src, 'wb') as f:
+            f.write(data)
+        out = self.path('out.jsonl')
+        with open(out, 'wb') as outfile:
+            outfile.write(b'head\n')
+            self.assertEqual(dl.append_file(src, outfile), len(data))
+            outfile.write(b'tail\n')
+        with open(out, 'rb') as f:
+            self.assertEqual(f.read(), b'head\n' + data + b'tail\n')
+
+    def test_append_file_fallback(self):
+        """append_file finishes with copyfileobj if copy_file_range fails part-way."""
+        src = self.path('shard.json')
+        data = os.urandom(100_000)
+        with open(src, 'wb') as f:
+            f.write(data)
+        real_copy = getattr(os, 'copy_file_range', None)
+        calls = []
+
+        def partial_copy(src_fd, dst_fd, count):
+            # Copy a little through the real call (or by hand) and then fail
+            if calls:
+                raise OSError(18, 'Invalid cross-device link')
+            calls.append(count)
+            if real_copy is not None:
+                return real_copy(src_fd, dst_fd, 1000)
+            return os.write(dst_fd, os.read(src_fd, 1000))
+
+        out = self.path('out.jsonl')
+        with mock.patch.object(dl.os, 'copy_file_range', partial_copy, create=True):
+            with open(out, 'wb') as outfile:
+                outfile.write(b'head\n')
+                self.assertEqual(dl.append_file(src, outfile), len(data))
+        with open(out, 'rb') as f:
+            self.assertEqual(f.read(), b'head\n' + data)
+
+    def run_stream_shard(self, body, checksum=None, pages=None):
+        """Run stream_shard on ``body`` and return (data, error) from its queue."""
+        url = 'https://dumps.example.org/shard.json.bz2'
+        pages = dict(pages or {}, **{url: body})
+        chunks = queue.Queue()
+        with mock.patch.object(dl, '_urlopen', fake_urlopen(pages)):
+            dl.stream_shard(url, NullProgress(), chunks, threading.Event(), checksum)
+        data = []
+        while True:
+            item = chunks.get_nowait()
+            if item is None:
+                return b''.join(data), None
+            if isinstance(item, BaseException):
+                return b''.join(data), item
+            data.append(item)
+
+    def test_stream_shard_multi_stream(self):
+        """Concatenated bz2 streams decompress into one shard."""
+        parts = [b'{"a": 1}\n' * 5000, os.urandom(50_000), b'{"b": 2}\n']
+        body = b''.join(bz2.compress(part) for part in parts)
+        data, error = self.run_stream_shard(body)
+        self.assertIsNone(error)
+        self.assertEqual(data, b''.join(parts))
+
+    def test_stream_shard_truncated(self):
+        """A shard cut off inside a bz2 stream is an error, not a short shard."""
+        first, second = bz2.compress(b'x' * 10_000), bz2.compress(b'y' * 10_000)
+        for body in (first[:-10], first + second[:-10], first + second[:4]):
+            data, error = self.run_stream_shard(body)
+            self.assertIsInstance(error, EOFError)
+
+    def test_stream_shard_cut_between_streams(self):
+        """A connection closed between two bz2 streams is caught by the size check."""
+        first, second = bz2.compress(b'x' * 10_000), bz2.compress(b'y' * 10_000)
+
+        def page(headers):
+            # Resume requests get nothing more
+            if 'Range' in headers:
+                return FakeResponse(b'', status=206)
+            return FakeResponse(first, length=len(first + second))
+
+        data, error = self.run_stream_shard(page)
+        self.assertIsInstance(error, IOError)
+        self.assertIn(f"Downloaded {len(first)} bytes", str(error))
+
+    def test_stream_shard_resumes_dropped_connection(self):
+        """A dropped shard picks up where it stopped with a Range request."""
+        body = bz2.compress(os.urandom(50_000)) + bz2.compress(b'{"a": 1}\n' * 1000)
+        cut = len(body) // 3
+        requests = []
+
+        def page(headers):
+            requests.append(headers.get('Range'))
+            if 'Range' in headers:
+                start = int(headers['Range'][len('bytes='):-1])
+                return FakeResponse(body[start:start + cut], status=206)
+            return FakeResponse(body[:cut], length=len(body))
+
+        data, error = self.run_stream_shard(page)
+        self.assertIsNone(error)
+        self.assertEqual(data, bz2.decompress(body))
+        self.assertEqual(requests, [None] + [f'bytes={start}-' for start in range(cut, len(body), cut)])
+
+    def test_stream_shard_resume_not_supported(self):
+        """A dropped shard fails if the server answers the Range request in full."""
+        body = bz2.compress(os.urandom(50_000))
+        page = lambda headers: FakeResponse(body[:1000], length=len(body))
+        data, error = self.run_stream_shard(page)
+        self.assertIsInstance(error, IOError)
+        self.assertIn("can't resume", str(error))
+
+    def test_stream_shard_checksum(self):
+        """The compressed bytes are checked against the shard's checksum file."""
+        body = bz2.compress(b'{"a": 1}\n')
+        checksum_url = 'https://dumps.example.org/shard.json.bz2.sha256'
+        good = hashlib.sha256(body).hexdigest().encode() + b'  shard.json.bz2\n'
+        data, error = self.run_stream_shard(body, ('sha256', checksum_url), {checksum_url: good})
+        self.assertIsNone(error)
+        self.assertEqual(data, b'{"a": 1}\n')
+
+        dl._fetch.cache_clear()
+        bad = b'0' * 64 + b'  shard.json.bz2\n'
+        data, error = self.run_stream_shard(body, ('sha256', checksum_url), {checksum_url: bad})
+        self.assertIsInstance(error, ValueError)
+
+
+class SlowResponse(FakeResponse):
+    """FakeResponse that hands out at most ``piece`` bytes per read, ``delay`` seconds apart."""
+
+    def __init__(self, body, delay, piece=1000):
+        super().__init__(body)
+        self.delay = delay
+        self.piece = piece
+
+    def read(self, size=-1):
+        time.sleep(self.delay)
+        return super().read(self.piece if size < 0 else min(size, self.piece))
+
+
+class TestConcatenateShards(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.output_path = Path(self.tmp.name) / 'simplewiki-20250108-cirrussearch-content.json.gz'
+
+    def run_concatenate(self, pages, **kwargs):
+        """Run download_and_concatenate_shards over ``pages`` ({url: page}), quietly."""
+        sizes = {url: len(page) if isinstance(page, bytes) else 0 for url, page in pages.items()}
+        with mock.patch.object(dl, '_urlopen', fake_urlopen(pages)), \
+                mock.patch.object(dl, 'get_file_info', lambda url: (sizes[url], False)), \
+                mock.patch.object(dl, 'find_shard_checksums', lambda urls: {}), \
+                contextlib.redirect_stdout(io.StringIO()):
+            return dl.download_and_concatenate_shards(list(pages), self.output_path, **kwargs)
+
+    def read_output(self, compress):
+        if compress:
+            with gzip.open(self.output_path, 'rb') as f:
+                return f.read()
+        return self.output_path.read_bytes()
+
+    def assertCleanedUp(self):
+        self.assertEqual(os.listdir(self.tmp.name), [])
+
+    def shard_urls(self, count):
+        return [f'https://dumps.example.org/file-{i:06d}.json.bz2' for i in range(count)]
+
+    def test_shards_appended_in_order(self):
+        """Shards that finish out of order are still appended in order."""
+        parts = [f'{{"shard": {i}}}\n'.encode() * 2000 for i in range(6)]
+        bodies = [bz2.compress(part) for part in parts]
+        finished = []
+
+        def page(i):
+            def respond(headers):
+                # Earlier shards are slower, so later ones finish first
+                response = SlowResponse(bodies[i], delay=0.002 * (6 - i), piece=200)
+                read = response.read
+                def read_and_record(size=-1):
+                    data = read(size)
+                    if not data:
+                        finished.append(i)
+                    return data
+                response.read = read_and_record
+                return response
+            return respond
+
+        for stream in (False, True):
+            for compress in (True, False):
+                with self.subTest(stream=stream, compress=compress):
+                    finished.clear()
+                    pages = {url: page(i) for i, url in enumerate(self.shard_urls(6))}
+                    self.assertTrue(self.run_concatenate(pages, workers=3, stream=stream,
+                                                         compress=compress))
+                    self.assertEqual(self.read_output(compress), b''.join(parts))
+                    self.assertEqual(sorted(finished), list(range(6)))
+                    if not stream:
+                        self.assertNotEqual(finished, list(range(6)))
+                    self.output_path.unlink()
+                    self.assertCleanedUp()
+
+    def test_failed_shard_leaves_nothing_behind(self):
+        """One failed shard fails the run and removes the output and temp directory."""
+        def missing(headers):
+            raise urllib.error.HTTPError('https://dumps.example.org/', 404, 'Not Found', {}, None)
+
+        for stream in (False, True):
+            with self.subTest(stream=stream):
+                pages = {url: bz2.compress(b'{}\n') for url in self.shard_urls(4)}
+                pages[self.shard_urls(4)[2]] = missing
+                self.assertFalse(self.run_concatenate(pages, workers=2, stream=stream))
+                self.assertCleanedUp()
+
+    def test_failure_aborts_other_workers(self):
+        """When a shard fails, the shards still downloading stop instead of finishing."""
+        # About 20 s each at this pace if nothing stops them
+        body = bz2.compress(os.urandom(200_000))
+
+        def fails_soon(headers):
+            time.sleep(0.2)
+            raise urllib.error.HTTPError('https://dumps.example.org/', 503, 'Unavailable',
+                                         {}, None)
+
+        for stream in (False, True):
+            with self.subTest(stream=stream):
+                urls = self.shard_urls(4)
+                pages = {url: (lambda headers: SlowResponse(body, delay=0.01, piece=100))
+                         for url in urls}
+                pages[urls[0]] = fails_soon
+                start = time.monotonic()
+                with mock.patch.object(dl, 'REQUEST_RETRIES', 0):
+                    self.assertFalse(self.run_concatenate(pages, workers=4, stream=stream))
+                self.assertLess(time.monotonic() - start, 5)
+                self.assertCleanedUp()
+
+
+class CountingHandler(http.server.BaseHTTPRequestHandler):
+    """Serves a few fixed routes over keep-alive and counts the connections made."""
+
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+    connections = 0
+    # Number of upcoming /throttled requests to answer with 429
+    throttle = 0
+    routes = {
+        '/small': (200, {}, b'hello'),
+        '/big': (200, {}, b'x' * (1024 * 1024)),
+        '/redirect': (302, {'Location': '/small'}, b''),
+        '/missing': (404, {}, b'nope'),
+        '/busy': (429, {'Retry-After': '0'}, b'slow down'),
+    }
+
+    def setup(self):
+        super().setup()
+        type(self).connections += 1
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        path = self.path
+        if path == '/hangup':
+            # Answer, then close the connection without announcing it
+            self.close_connection = True
+            path = '/small'
+        if path == '/throttled':
+            path = '/small'
+            if type(self).throttle:
+                type(self).throttle -= 1
+                path = '/busy'
+        status, headers, body = self.routes[path]
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class QuietServer(http.server.ThreadingHTTPServer):
+    """Test server that doesn't print the resets caused by dropping connections."""
+
+    def handle_error(self, request, client_address):
+        pass
+
+
+class TestHTTPClient(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = QuietServer(('127.0.0.1', 0), CountingHandler)
+        threading.Thread(target=cls.server.serve_forever, args=(0.05,), daemon=True).start()
+        cls.netloc = f'127.0.0.1:{cls.server.server_port}'
+        cls.base = f'http://{cls.netloc}'
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        CountingHandler.connections = 0
+        CountingHandler.throttle = 0
+        # Start without a pooled connection and don't leave one behind
+        dl._drop_connection('http', self.netloc)
+        self.addCleanup(dl._drop_connection, 'http', self.netloc)
+        # Make sure no proxy from the environment is used
+        patcher = mock.patch.object(dl.urllib.request, 'getproxies', return_value={})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def get(self, path):
+        with dl._urlopen(self.base + path) as response:
+            return response.read()
+
+    def test_keep_alive(self):
+        """Sequential requests from one thread share a single connection."""
+        for _ in range(10):
+            self.assertEqual(self.get('/small'), b'hello')
+        self.assertEqual(CountingHandler.connections, 1)
+
+    def test_partly_read_body_is_not_reused(self):
+        """A connection with unread body bytes is dropped, not used for the next request."""
+        with dl._urlopen(self.base + '/big') as response:
+            self.assertEqual(response.read(10), b'x' * 10)
+        self.assertNotIn(('http', self.netloc), dl._connections.__dict__.get('pool', {}))
+        self.assertEqual(self.get('/small'), b'hello')
+        self.assertEqual(CountingHandler.connections, 2)
+
+    def test_redirect(self):
+        """Redirects are followed on the same connection and the final URL recorded."""
+        with dl._urlopen(self.base + '/redirect') as response:
+            self.assertEqual(response.read(), b'hello')
+            self.assertEqual(response.url, self.base + '/small')
+        self.assertEqual(CountingHandler.connections, 1)
+
+    def test_http_error(self):
+        """Error statuses raise HTTPError carrying the body, and the connection stays usable."""
+        with self.assertRaises(urllib.error.HTTPError) as cm:
+            dl._request(self.base + '/missing')
+        self.assertEqual(cm.exception.code, 404)
+        self.assertEqual(cm.exception.read(), b'nope')
+        self.assertEqual(self.get('/small'), b'hello')
+        self.assertEqual(CountingHandler.connections, 1)
+
+    def test_stale_connection_is_replaced(self):
+        """A pooled connection the server closed is replaced and the request retried."""
+        self.assertEqual(self.get('/hangup'), b'hello')
+        self.assertEqual(self.get('/small'), b'hello')
+        self.assertEqual(CountingHandler.connections, 2)
+
+    def test_throttled_request_is_retried(self):
+        """429 responses are retried after Retry-After, up to REQUEST_RETRIES times."""
+        CountingHandler.throttle = dl.REQUEST_RETRIES
+        self.assertEqual(self.get('/throttled'), b'hello')
+
+        CountingHandler.throttle = dl.REQUEST_RETRIES + 1
+        with self.assertRaises(urllib.error.HTTPError) as cm:
+            self.get('/throttled')
+        self.assertEqual(cm.exception.code, 429)
+        self.assertEqual(CountingHandler.connections, 1)
+
+    def test_retry_delay(self):
+        """Retry-After is honoured up to RETRY_MAX_DELAY, with exponential backoff otherwise."""
+        def error(headers):
+            return urllib.error.HTTPError('http://x/', 503, 'busy', headers, None)
+
+        self.assertEqual(dl._retry_delay(error({'Retry-After': '7'}), 0), 7)
+        self.assertEqual(dl._retry_delay(error({'Retry-After': '3600'}), 0), dl.RETRY_MAX_DELAY)
+        self.assertEqual(dl._retry_delay(error({}), 2), 4)
+        self.assertEqual(dl._retry_delay(error({'Retry-After': 'Wed, 21 Oct 2015 07:28:00 GMT'}), 1), 2)
+
+    def test_user_agent(self):
+        """A descriptive User-Agent is sent unless the caller sets one."""
+        seen = []
+        original = CountingHandler.do_GET
+
+        def do_GET(handler):
+            seen.append(handler.headers['User-Agent'])
+            original(handler)
+
+        with mock.patch.object(CountingHandler, 'do_GET', do_GET):
+            self.get('/small')
+            with dl._urlopen(self.base + '/small', headers={'User-Agent': 'custom'}) as response:
+                response.read()
+        self.assertEqual(seen, [dl.USER_AGENT, 'custom'])
+
+
+class TestCommandLine(unittest.TestCase):
+
+    def test_positive_int(self):
+        """Worker counts below 1 are rejected when the arguments are parsed."""
+        self.assertEqual(dl.positive_int('3'), 3)
+        for value in ('0', '-2', 'abc'):
+            with self.subTest(value=value):
+                with self.assertRaises(dl.argparse.ArgumentTypeError):
+                    dl.positive_int(value)
+
+
+if __name__ == '__main__':
+    unittest.main()
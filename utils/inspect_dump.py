@@ -12,7 +12,12 @@ def inspect_cirrus_dump(file_path, target_title=None):
         return
 
     found = False
-    with gzip.open(file_path, 'rt', encoding='utf-8') as f:
+    # Dumps are gzipped (.json.gz) unless downloaded with --no-compress (.jsonl)
+    if file_path.endswith('.gz'):
+        f = gzip.open(file_path, 'rt', encoding='utf-8')
+    else:
+        f = open(file_path, 'r', encoding='utf-8')
+    with f:
         for line in f:
             try:
                 data = json.loads(line)